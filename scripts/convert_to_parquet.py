@@ -3,6 +3,7 @@
 from pathlib import Path
 
 import polars as pl
+import pyarrow.parquet as pq
 from loguru import logger
 
 
@@ -12,28 +13,31 @@ def convert_tsv_to_parquet() -> None:
     tsv_path = Path("data/crocodiles/occurrence.tsv")
     parquet_path = Path("data/crocodiles/occurrence_full.parquet")
 
-    logger.info(f"Reading {tsv_path}...")
-    data = pl.read_csv(
+    # The streaming engine parses the TSV and writes the Parquet in bounded batches,
+    # so the whole table is never held in memory. ALL columns are kept.
+    tsv_scan = pl.scan_csv(
         source=tsv_path,
         separator="\t",
         quote_char=None,
         truncate_ragged_lines=True,
     )
 
-    logger.info(f"Original data: {len(data):,} rows × {len(data.columns)} columns")
+    # Count the source rows with a streaming pass, still without loading the table
+    original_rows = tsv_scan.select(pl.len()).collect(engine="streaming").item()
+    original_columns = tsv_scan.collect_schema().len()
+    logger.info(f"Original data: {original_rows:,} rows × {original_columns} columns")
 
-    # Keep ALL columns, just convert format
-    logger.info(f"Writing to {parquet_path}...")
-    data.write_parquet(
-        file=parquet_path,
+    logger.info(f"Converting {tsv_path} to {parquet_path}...")
+    tsv_scan.sink_parquet(
+        path=parquet_path,
         compression="zstd",  # Better compression than default
     )
 
-    # Verify
-    parquet_data = pl.read_parquet(source=parquet_path)
-    logger.info(
-        f"Parquet data: {len(parquet_data):,} rows × {len(parquet_data.columns)} columns",
-    )
+    # Verify from the footer metadata, without decoding the file again
+    parquet_file = pq.ParquetFile(source=parquet_path)
+    num_rows = parquet_file.metadata.num_rows
+    num_columns = len(parquet_file.schema_arrow)
+    logger.info(f"Parquet data: {num_rows:,} rows × {num_columns} columns")
 
     # Show file sizes
     tsv_size = tsv_path.stat().st_size / (1024 * 1024)
@@ -45,9 +49,15 @@ def convert_tsv_to_parquet() -> None:
     logger.info(f"{'':<2}TSV: {tsv_size:>10,.2f} MB")
     logger.info(f"{'':<2}Parquet: {parquet_size:>10,.2f} MB")
     logger.info(f"{'':<2}Savings: {savings:>10,.2f} MB ({savings_pct:.1f}%)")
+    if (num_rows, num_columns) != (original_rows, original_columns):
+        logger.warning(
+            f"Data loss - TSV has {original_rows:,} rows × {original_columns} columns, "
+            f"Parquet has {num_rows:,} rows × {num_columns} columns!",
+        )
+        return
+
     logger.success(
-        f"No data loss - all {len(parquet_data):,} rows "
-        f"and {len(parquet_data.columns)} columns preserved!",
+        f"No data loss - all {num_rows:,} rows and {num_columns} columns preserved!",
     )
 
 
@@ -8,7 +8,9 @@ try:
     import sys
 
     import geopandas as gpd
+    import numpy as np
     import polars as pl
+    import shapely
     import streamlit as st
 
     # Ensure repo root is on PYTHONPATH
@@ -25,6 +27,7 @@ try:
         render_section_header,
     )
     from config import COUNTRY_DATA_SOURCE, CROCODILE_DATA_SOURCE
+    from spatial import locate_countries
     from styles import get_custom_css
     from translations import (
         ANALYTICS_TOP_SPECIES_DESCRIPTION,
@@ -41,6 +44,7 @@ try:
         OVERVIEW_DESCRIPTION,
         OVERVIEW_TITLE,
         SIDEBAR_FILTERS_TITLE,
+        SIDEBAR_VIZ_TITLE,
         TAB_ANALYTICS,
         TAB_DATA_TABLE,
         TAB_DISTRIBUTION,
@@ -48,6 +52,8 @@ try:
         TABLE_DESCRIPTION,
         TABLE_RECORDS_LABEL,
         TABLE_TITLE,
+        VIZ_GPU_HELP,
+        VIZ_GPU_LABEL,
     )
     from visualization import (
         create_top_species_chart,
@@ -72,20 +78,73 @@ try:
     # ------------------------------------------------------------
     # DATA LOADING FUNCTIONS
     # ------------------------------------------------------------
+    REQUIRED_COLS = ["species", "decimalLatitude", "decimalLongitude"]
+    COORDINATE_COLS = ["decimalLatitude", "decimalLongitude"]
+    SAMPLE_SIZE = 500
+    # Un único predicado fusionado: descarta coordenadas nulas, NaN o infinitas
+    HAS_VALID_COORDS = pl.all_horizontal(pl.col(COORDINATE_COLS).is_finite())
+
+
+    def scan_raw_sample() -> pl.LazyFrame:
+        """Construir el plan perezoso de la muestra cruda: las primeras filas del Parquet.
+
+        Tanto los datos de la aplicación como las estadísticas de calidad parten de este
+        mismo plan, para que todas las métricas describan la misma población.
+        """
+        return pl.scan_parquet(source=os.path.join(DATA_DIR, CROCODILE_DATA_SOURCE)).head(
+            SAMPLE_SIZE,
+        )
+
+
+    def load_crocodiles_data() -> pl.LazyFrame:
+        """Construir el plan perezoso de ocurrencias de cocodrilos desde Parquet.
+
+        Polars empuja la proyección de columnas y el límite de filas hasta el lector de
+        Parquet; sobre esa muestra se descartan los registros sin especie o coordenadas.
+        Nada se lee hasta que se recolecta el plan.
+        """
+        return (
+            scan_raw_sample()
+            .select(REQUIRED_COLS)
+            .filter(pl.col("species").is_not_null() & HAS_VALID_COORDS)
+        )
+
+
+    @st.cache_resource(show_spinner=False)
+    def load_table_data() -> pl.DataFrame:
+        """Cargar todas las columnas de la muestra cruda para el explorador de datos.
+
+        El resto de la aplicación solo proyecta ``REQUIRED_COLS``; la tabla conserva todas
+        las columnas originales con el mismo filtro de registros válidos.
+        """
+        return (
+            scan_raw_sample()
+            .filter(pl.col("species").is_not_null() & HAS_VALID_COORDS)
+            .rename({"species": "Especie"})
+            .collect()
+        )
+
+
     @st.cache_data(show_spinner=False)
-    def load_crocodiles_data() -> gpd.GeoDataFrame:
-        """Cargar datos de ocurrencia de cocodrilos desde Parquet."""
-        data = pl.read_parquet(source=os.path.join(DATA_DIR, CROCODILE_DATA_SOURCE)).head(500)
-        df = data.to_pandas()
-        gdf = gpd.GeoDataFrame(
-            data=df,
-            geometry=gpd.points_from_xy(
-                x=df.decimalLongitude,
-                y=df.decimalLatitude,
-            ),
-            crs="EPSG:4326",
+    def load_raw_quality_stats() -> tuple[int, int]:
+        """Contar registros totales y con coordenadas válidas en la muestra cruda.
+
+        Solo se leen las dos columnas de coordenadas de las mismas filas que usa
+        ``load_crocodiles_data``.
+
+        Returns:
+            Tupla con (total_registros, registros_con_coordenadas).
+        """
+        stats = (
+            scan_raw_sample()
+            .select(COORDINATE_COLS)
+            .select(
+                pl.len().alias("total"),
+                HAS_VALID_COORDS.sum().alias("valid"),
+            )
+            .collect()
         )
-        return gdf
+        return stats["total"].item(), stats["valid"].item()
 
 
     @st.cache_data(show_spinner=False)
@@ -102,34 +161,92 @@ try:
     # ------------------------------------------------------------
     # DATA CLEANING FUNCTIONS
     # ------------------------------------------------------------
-    def clean_crocodile_data(data: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
-        """Limpiar datos brutos de ocurrencias de cocodrilos."""
-        cleaned = data.dropna(subset=["species", "decimalLatitude", "decimalLongitude"]).copy()
-        cleaned.rename(columns={"species": "Especie"}, inplace=True)
-        return cleaned
+    def clean_crocodile_data(data: pl.LazyFrame) -> pl.LazyFrame:
+        """Limpiar datos brutos de ocurrencias de cocodrilos.
+
+        Los registros sin especie o coordenadas ya se descartan durante el escaneo. La
+        especie se guarda como categórica: pocas especies repetidas en muchos registros, y
+        las coordenadas en float32, cuya precisión (~1 m) basta para los mapas.
+        """
+        return data.rename({"species": "Especie"}).with_columns(
+            pl.col("Especie").cast(pl.Categorical),
+            pl.col(COORDINATE_COLS).cast(pl.Float32),
+        )
 
 
-    @st.cache_data(show_spinner=False)
-    def load_and_clean_data() -> tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]:
-        """Cargar y limpiar datos de cocodrilos (cached).
+    def assign_countries(data: pl.DataFrame, country_data: gpd.GeoDataFrame) -> pl.DataFrame:
+        """Agregar la columna 'País' con el país que contiene cada registro.
+
+        La búsqueda espacial se hace una sola vez al cargar los datos; los conteos por país
+        de cada filtro quedan como agrupaciones sobre esta columna.
+        """
+        coords = data.select(["decimalLongitude", "decimalLatitude"]).to_numpy()
+        country_idx = locate_countries(
+            points=np.asarray(shapely.points(coords)),
+            country_data=country_data,
+        )
+        # Traduce posiciones a nombres sin pasar por un arreglo de objetos; -1 queda nulo
+        names = country_data["ADMIN"].tolist()
+        countries = pl.Series(name="País", values=country_idx).replace_strict(
+            old=range(len(names)),
+            new=names,
+            default=None,
+            return_dtype=pl.String,
+        )
+        return data.with_columns(countries.cast(pl.Categorical))
+
+
+    @st.cache_resource(show_spinner=False)
+    def load_and_clean_data() -> pl.LazyFrame:
+        """Cargar y limpiar datos de cocodrilos, con su país ya asignado (cached).
 
         Returns:
-            Tupla con (datos_limpios, datos_sin_limpiar).
+            Plan perezoso con los datos limpios.
         """
-        raw_data = load_crocodiles_data()
-        cleaned_data = clean_crocodile_data(data=raw_data)
-        return cleaned_data, raw_data
+        data = clean_crocodile_data(data=load_crocodiles_data()).collect()
+        return assign_countries(data=data, country_data=load_country_data()).lazy()
 
 
     @st.cache_data(show_spinner=False)
-    def get_species_options(_data: gpd.GeoDataFrame) -> list[str]:
+    def get_species_options(_data: pl.LazyFrame) -> list[str]:
         """Obtener lista única de especies (cached, con underscore para evitar hashing)."""
-        return sorted(_data["Especie"].unique().tolist())
+        return (
+            _data.select(pl.col("Especie").unique().cast(pl.String).sort())
+            .collect()
+            .to_series()
+            .to_list()
+        )
 
 
     # ------------------------------------------------------------
     # MAIN APP LOGIC
     # ------------------------------------------------------------
+    @st.fragment
+    def render_data_table(selected_species: list[str]) -> None:
+        """Renderizar la tabla de datos como fragmento.
+
+        Mover el slider de registros solo vuelve a ejecutar esta función, no la app
+        completa con sus mapas y gráficos. La tabla muestra todas las columnas originales,
+        proyectadas aparte del resto de la aplicación.
+        """
+        num_records = st.slider(
+            label=TABLE_RECORDS_LABEL,
+            min_value=10,
+            max_value=1000,
+            value=100,
+            step=10,
+        )
+
+        table_data = load_table_data()
+        if selected_species:
+            table_data = table_data.filter(pl.col("Especie").is_in(selected_species))
+        st.dataframe(
+            data=table_data.head(num_records),
+            hide_index=True,
+            width="stretch",
+        )
+
+
     def main() -> None:
         """Aplicación principal con diseño académico profesional."""
         
@@ -138,7 +255,8 @@ try:
 
         # Cargar datos
         with st.spinner("Cargando datos..."):
-            data, raw_data = load_and_clean_data()
+            data = load_and_clean_data()
+            raw_stats = load_raw_quality_stats()
             countries = load_country_data()
 
         # Sidebar con filtros
@@ -160,8 +278,19 @@ try:
                 help=FILTER_TOP_N_HELP,
             )
 
-        # Aplicar filtros
-        filtered_data = data[data["Especie"].isin(selected_species)] if selected_species else data
+            st.markdown(f"### {SIDEBAR_VIZ_TITLE}")
+
+            use_gpu = st.toggle(
+                label=VIZ_GPU_LABEL,
+                value=False,
+                help=VIZ_GPU_HELP,
+            )
+
+        # Aplicar filtros dentro del plan perezoso y solo entonces materializar
+        filtered_plan = (
+            data.filter(pl.col("Especie").is_in(selected_species)) if selected_species else data
+        )
+        filtered_data = filtered_plan.collect().to_pandas()
 
         # Validar datos
         if len(filtered_data) == 0:
@@ -174,8 +303,7 @@ try:
         # Dashboard de métricas
         render_metrics_dashboard(
             data=filtered_data,
-            raw_data=raw_data,
-            country_data=countries,
+            raw_stats=raw_stats,
         )
 
         # Tabs principales
@@ -211,7 +339,11 @@ try:
                 title=DISTRIBUTION_POINTS_TITLE,
                 description=DISTRIBUTION_POINTS_DESCRIPTION,
             )
-            render_point_map(data=filtered_data)
+            render_point_map(
+                data=filtered_data,
+                selected_species=selected_species,
+                use_gpu=use_gpu,
+            )
 
             st.markdown("---")
 
@@ -221,6 +353,7 @@ try:
             )
             render_choropleth_map(
                 data=filtered_data,
+                selected_species=selected_species,
                 country_data=countries,
             )
 
@@ -240,20 +373,7 @@ try:
                 description=TABLE_DESCRIPTION,
             )
 
-            num_records = st.slider(
-                label=TABLE_RECORDS_LABEL,
-                min_value=10,
-                max_value=1000,
-                value=100,
-                step=10,
-            )
-
-            display_data = filtered_data.drop(columns=["geometry"]).head(num_records)
-            st.dataframe(
-                data=display_data,
-                hide_index=True,
-                width="stretch",
-            )
+            render_data_table(selected_species=selected_species)
 
         # Footer
         render_footer()
@@ -3,37 +3,39 @@ Componentes profesionales siguiendo mejores prácticas de UX.
 """
 
 from datetime import datetime
+from functools import lru_cache
 
-import geopandas as gpd
+import pandas as pd
 import streamlit as st
 
 from translations import HEADER_SUBTITLE, HEADER_TITLE
 
-
-def render_header() -> None:
-    """Renderiza el header principal de la aplicación."""
-    st.markdown(
-        f"""
+# HTML estático construido una sola vez al importar el módulo, no en cada rerun
+_HEADER_HTML = f"""
         <div class="main-header">
             <h1>{HEADER_TITLE}</h1>
             <p>{HEADER_SUBTITLE}</p>
         </div>
-        """,
+        """
+
+
+def render_header() -> None:
+    """Renderiza el header principal de la aplicación."""
+    st.markdown(
+        _HEADER_HTML,
         unsafe_allow_html=True,
     )
 
 
 def render_metrics_dashboard(
-    data: gpd.GeoDataFrame,
-    raw_data: gpd.GeoDataFrame,
-    country_data: gpd.GeoDataFrame,
+    data: pd.DataFrame,
+    raw_stats: tuple[int, int],
 ) -> None:
     """Renderiza el dashboard de métricas principales.
 
     Args:
-        data: GeoDataFrame con los datos limpios de crocodílidos.
-        raw_data: GeoDataFrame con los datos sin limpiar (para calcular calidad).
-        country_data: GeoDataFrame con los datos de países.
+        data: DataFrame con los datos limpios de crocodílidos.
+        raw_stats: Tupla (total_registros, registros_con_coordenadas) de la muestra cruda.
     """
     col1, col2, col3, col4 = st.columns(4)
 
@@ -53,14 +55,8 @@ def render_metrics_dashboard(
         )
 
     with col3:
-        # Spatial join para contar países
-        joined = gpd.sjoin(
-            data,
-            country_data,
-            how="inner",
-            predicate="within",
-        )
-        unique_countries = joined["ADMIN"].nunique()
+        # El país de cada registro se asigna al cargar los datos
+        unique_countries = data["País"].nunique()
         render_metric_card(
             label="Países con Presencia",
             value=str(unique_countries),
@@ -69,8 +65,8 @@ def render_metrics_dashboard(
 
     with col4:
         # Calcular calidad de datos (% de registros originales con coordenadas válidas)
-        valid_coords = raw_data.dropna(subset=["decimalLatitude", "decimalLongitude"])
-        quality_pct = (len(valid_coords) / len(raw_data)) * 100 if len(raw_data) > 0 else 0
+        total_rows, valid_rows = raw_stats
+        quality_pct = (valid_rows / total_rows) * 100 if total_rows > 0 else 0
         render_metric_card(
             label="Calidad de Datos",
             value=f"{quality_pct:.1f}%",
@@ -100,6 +96,23 @@ def render_metric_card(label: str, value: str, delta: str | None) -> None:
     )
 
 
+@lru_cache(maxsize=64)
+def _section_html(title: str, description: str) -> tuple[str, str]:
+    """Construye (y memoriza) el Markdown y HTML de un header de sección.
+
+    Args:
+        title: Título de la sección.
+        description: Descripción o contexto de la sección.
+
+    Returns:
+        Tupla con (título_markdown, descripción_html).
+    """
+    return (
+        f"### {title}",
+        f"<p style='color: #6b7280; margin-bottom: 1.5rem;'>{description}</p>",
+    )
+
+
 def render_section_header(title: str, description: str) -> None:
     """Renderiza un header de sección con título y descripción.
 
@@ -107,9 +120,10 @@ def render_section_header(title: str, description: str) -> None:
         title: Título de la sección.
         description: Descripción o contexto de la sección.
     """
-    st.markdown(f"### {title}")
+    title_md, description_html = _section_html(title=title, description=description)
+    st.markdown(title_md)
     st.markdown(
-        f"<p style='color: #6b7280; margin-bottom: 1.5rem;'>{description}</p>",
+        description_html,
         unsafe_allow_html=True,
     )
 
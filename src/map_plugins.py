@@ -0,0 +1,50 @@
+"""Plugins de Folium propios de la aplicación.
+
+Se importa dentro de las funciones que dibujan mapas, igual que Folium, para no pagar su
+importación antes de que se dibujen el header y las métricas.
+"""
+
+from folium.plugins import FastMarkerCluster
+from folium.template import Template
+
+
+class ChunkedMarkerCluster(FastMarkerCluster):
+    """FastMarkerCluster que agrega los marcadores en bloque.
+
+    FastMarkerCluster agrega los marcadores uno a uno; esta plantilla los agrega con
+    `addLayers`, que es lo que habilita la carga por partes (`chunkedLoading`) del cluster.
+    Opcionalmente asigna un único popup al grupo en lugar de uno por marcador.
+
+    Args:
+        data: Filas de datos que recibe `callback`, una por marcador.
+        popup: Función JavaScript `function (layer) {...}` que arma el popup de cada
+            marcador del grupo a partir de las opciones que le dio `callback`.
+        **kwargs: Resto de argumentos de FastMarkerCluster.
+    """
+
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = (function(){
+                {{ this.callback }}
+
+                var data = {{ this.data|tojson }};
+                var cluster = L.markerClusterGroup({{ this.options|tojavascript }});
+                {%- if this.icon_create_function is not none %}
+                cluster.options.iconCreateFunction =
+                    {{ this.icon_create_function.strip() }};
+                {%- endif %}
+                {%- if this.popup is not none %}
+                cluster.bindPopup({{ this.popup.strip() }});
+                {%- endif %}
+                cluster.addLayers(data.map(callback));
+
+                cluster.addTo({{ this._parent.get_name() }});
+                return cluster;
+            })();
+        {% endmacro %}"""
+    )
+
+    def __init__(self, data: list, popup: str | None = None, **kwargs) -> None:
+        super().__init__(data=data, **kwargs)
+        self.popup = popup
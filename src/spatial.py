@@ -0,0 +1,46 @@
+"""Utilidades espaciales para asignar ocurrencias a países.
+
+Reutiliza un único índice espacial de los polígonos de países entre reruns.
+"""
+
+import geopandas as gpd
+import numpy as np
+import shapely
+import streamlit as st
+
+
+@st.cache_resource(show_spinner=False)
+def get_country_tree(_country_data: gpd.GeoDataFrame) -> shapely.STRtree:
+    """Construye el índice STRtree de los polígonos de países (cached).
+
+    Los datos de países se cargan una sola vez, por lo que el árbol se construye una vez por
+    proceso (underscore para evitar hashing).
+
+    Args:
+        _country_data: GeoDataFrame con polígonos de países.
+
+    Returns:
+        Árbol espacial con un elemento por fila de `_country_data`.
+    """
+    return shapely.STRtree(_country_data.geometry.values)
+
+
+def locate_countries(
+    points: np.ndarray,
+    country_data: gpd.GeoDataFrame,
+) -> np.ndarray:
+    """Busca el país que contiene cada punto de ocurrencia.
+
+    Args:
+        points: Arreglo de puntos de shapely.
+        country_data: GeoDataFrame con polígonos de países.
+
+    Returns:
+        Posición en `country_data` del país de cada punto, o -1 si no cae dentro de
+        ningún país.
+    """
+    tree = get_country_tree(_country_data=country_data)
+    point_idx, polygon_idx = tree.query(points, predicate="within")
+    countries = np.full(shape=len(points), fill_value=-1, dtype=np.int64)
+    countries[point_idx] = polygon_idx
+    return countries
@@ -2,10 +2,9 @@
 Diseño académico y profesional siguiendo mejores prácticas de UX.
 """
 
+import re
 
-def get_custom_css() -> str:
-    """Retorna el CSS personalizado para la aplicación."""
-    return """
+_RAW_CSS = """
     <style>
     /* Forzar tema claro */
     .stApp {
@@ -162,8 +161,8 @@ def get_custom_css() -> str:
         box-shadow: 0 1px 3px 0 rgba(0, 0, 0, 0.1);
     }
 
-    /* Contenedores de mapas */
-    .map-container {
+    /* Contenedores de mapas: los mapas son los únicos iframes de la app */
+    iframe[data-testid="stIFrame"] {
         border-radius: 0.5rem;
         overflow: hidden;
         box-shadow: 0 1px 3px 0 rgba(0, 0, 0, 0.1);
@@ -304,3 +303,27 @@ def get_custom_css() -> str:
     }
     </style>
     """
+
+
+def _minify_css(css: str) -> str:
+    """Elimina comentarios y espacios innecesarios del CSS.
+
+    Args:
+        css: Código CSS legible.
+
+    Returns:
+        CSS equivalente en una sola línea.
+    """
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};])\s*", r"\1", css)
+    return css.strip()
+
+
+# Minificado una sola vez al importar: menos bytes enviados al navegador en cada rerun
+_CUSTOM_CSS = _minify_css(css=_RAW_CSS)
+
+
+def get_custom_css() -> str:
+    """Retorna el CSS personalizado para la aplicación (constante del módulo)."""
+    return _CUSTOM_CSS
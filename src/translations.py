@@ -20,6 +20,13 @@ FILTER_SPECIES_HELP = "Filtre por una o más especies de interés. Deje vacío p
 FILTER_TOP_N_LABEL = "Top N especies a mostrar"
 FILTER_TOP_N_HELP = "Número de especies más comunes a visualizar en los gráficos"
 
+# Opciones de visualización
+VIZ_GPU_LABEL = "Renderizado con GPU (deck.gl)"
+VIZ_GPU_HELP = (
+    "Dibuja los puntos con WebGL en lugar de agruparlos. Recomendado para conjuntos "
+    "grandes de registros."
+)
+
 # Métricas
 METRIC_TOTAL_RECORDS = "Total de Registros"
 METRIC_SPECIES_COUNT = "Especies Únicas"
@@ -107,5 +114,6 @@ ERROR_VISUALIZATION = "Error al generar la visualización."
 
 # Ayuda y tooltips
 HELP_POINT_MAP = "Haga clic en los puntos para ver información detallada de cada registro."
+HELP_POINT_DECK = "Pase el cursor sobre los puntos para ver la especie de cada registro."
 HELP_CHOROPLETH = "Los colores más oscuros indican mayor diversidad de especies."
 HELP_BAR_CHART = "Gráfico interactivo. Haga clic y arrastre para hacer zoom."
@@ -3,30 +3,134 @@
 Funciones optimizadas para renderizar visualizaciones interactivas de alta calidad.
 """
 
-import folium
+import json
+from typing import TYPE_CHECKING
+
 import geopandas as gpd
-import plotly.express as px
+import numpy as np
+import pandas as pd
+import polars as pl
+import shapely
 import streamlit as st
-from branca.colormap import LinearColormap
-from folium.plugins import FastMarkerCluster
-from streamlit_folium import st_folium
+import streamlit.components.v1 as components
 
 from translations import (
     HELP_BAR_CHART,
     HELP_CHOROPLETH,
+    HELP_POINT_DECK,
     HELP_POINT_MAP,
 )
 
+# Folium, Plotly, Branca y pydeck se importan dentro de cada función para no
+# pagar su importación (~1 s) antes de que se dibujen el header y las métricas.
+if TYPE_CHECKING:
+    import folium
+    import plotly.graph_objects as go
+    import pydeck as pdk
+
+SIMPLIFY_TOLERANCE = 0.05  # Grados; sin cambios visibles a escala mundial
+COORDINATE_DECIMALS = 5  # ~1 m en el ecuador, más que suficiente para los marcadores
+SPECIES_COLORS = ["#fee5d9", "#fcae91", "#fb6a4a", "#de2d26", "#a50f15"]
+NO_SPECIES_COLOR = "#f0f0f0"
+
+# Crea un marcador por fila [lat, lon, especie]; la especie queda en las opciones del
+# marcador para el popup del grupo. Son fijos, así que se definen una sola vez.
+MARKER_CALLBACK = "function (row) { return L.marker([row[0], row[1]], {especie: row[2]}); }"
+MARKER_POPUP = 'function (layer) { return "<b>Especie:</b> " + layer.options.especie; }'
+
+
+def _compact_points(data: pd.DataFrame) -> pd.DataFrame:
+    """Selecciona [lat, lon, especie] con coordenadas redondeadas para serializar a JSON.
+
+    Con 5 decimales (~1 m) el JSON enviado al navegador es más corto sin cambio visible.
+    Se redondea en float64: un float32 redondeado sigue serializándose con ~15 dígitos.
+
+    Args:
+        data: DataFrame con datos de ocurrencia.
+
+    Returns:
+        DataFrame con columnas 'decimalLatitude', 'decimalLongitude' y 'Especie'.
+    """
+    columns = ["decimalLatitude", "decimalLongitude", "Especie"]
+    return (
+        data[columns]
+        .astype({"decimalLatitude": np.float64, "decimalLongitude": np.float64})
+        .round(COORDINATE_DECIMALS)
+    )
+
+
+def _marker_payload(data: pd.DataFrame) -> list[list[float | str]]:
+    """Prepara las filas [lat, lon, especie] de FastMarkerCluster.
+
+    Args:
+        data: DataFrame con datos de ocurrencia.
+
+    Returns:
+        Lista de filas serializables a JSON, una por registro.
+    """
+    # Las coordenadas ya vienen filtradas en el plan de carga; pandas extrae las filas en C
+    return _compact_points(data=data).to_numpy().tolist()
+
+
+def create_point_deck(data: pd.DataFrame) -> "pdk.Deck":
+    """Crea un mapa de puntos de deck.gl que se dibuja con WebGL en la GPU.
+
+    A diferencia de FastMarkerCluster no crea un marcador del DOM por registro, por lo que
+    escala a conjuntos grandes de ocurrencias. Los puntos se reducen a uno por celda de
+    ~1 m y especie antes de enviarlos al navegador.
 
-def create_point_map(data: gpd.GeoDataFrame) -> folium.Map:
+    Args:
+        data: DataFrame con columnas 'decimalLatitude', 'decimalLongitude', 'Especie'.
+
+    Returns:
+        Deck de pydeck con una capa de dispersión.
+    """
+    import pydeck as pdk
+
+    # Registros repetidos en la misma celda de ~1 m y de la misma especie se dibujan como el
+    # mismo punto: se envía uno solo. En GBIF son frecuentes: la muestra de la app pasa de
+    # 399 registros a 58 puntos, y el archivo completo de 219k a 126k.
+    points = _compact_points(data=data).drop_duplicates(ignore_index=True)
+
+    layer = pdk.Layer(
+        type="ScatterplotLayer",
+        data=points,
+        id="occurrences",  # Id fijo: un id aleatorio cambiaría el JSON en cada rerun
+        get_position="[decimalLongitude, decimalLatitude]",
+        get_radius=500,
+        radius_min_pixels=3,
+        get_fill_color=[165, 15, 21, 160],
+        pickable=True,
+    )
+
+    return pdk.Deck(
+        layers=[layer],
+        initial_view_state=pdk.ViewState(
+            latitude=float(data["decimalLatitude"].mean()),
+            longitude=float(data["decimalLongitude"].mean()),
+            zoom=1,
+        ),
+        map_provider="carto",
+        map_style=pdk.map_styles.CARTO_LIGHT,
+        tooltip={"html": "<b>Especie:</b> {Especie}"},
+    )
+
+
+def create_point_map(data: pd.DataFrame) -> "folium.Map":
     """Crea un mapa interactivo con puntos de ocurrencia usando FastMarkerCluster.
 
+    Los marcadores se construyen en el navegador a partir de un único arreglo JSON.
+
     Args:
-        data: GeoDataFrame con columnas 'decimalLatitude', 'decimalLongitude', 'species'.
+        data: DataFrame con columnas 'decimalLatitude', 'decimalLongitude', 'Especie'.
 
     Returns:
         Mapa de Folium con puntos agrupados.
     """
+    import folium
+
+    from map_plugins import ChunkedMarkerCluster
+
     center_lat = data["decimalLatitude"].mean()
     center_lon = data["decimalLongitude"].mean()
 
@@ -36,60 +140,115 @@ def create_point_map(data: gpd.GeoDataFrame) -> folium.Map:
         tiles="CartoDB positron",
     )
 
-    # Preparar datos para FastMarkerCluster
-    callback = """\
-    function (row) {
-        var marker = L.marker(new L.LatLng(row[0], row[1]));
-        marker.bindPopup("<b>Especie:</b> " + row[2]);
-        return marker;
-    }
+    ChunkedMarkerCluster(
+        data=_marker_payload(data=data),
+        callback=MARKER_CALLBACK,
+        popup=MARKER_POPUP,
+        chunkedLoading=True,  # Cede el hilo del navegador entre bloques de marcadores
+        chunkInterval=200,
+        chunkDelay=50,
+        maxClusterRadius=80,
+    ).add_to(point_map)
+
+    return point_map
+
+
+def _species_by_country(
+    data: pd.DataFrame,
+    country_data: gpd.GeoDataFrame,
+) -> np.ndarray:
+    """Cuenta especies únicas por país.
+
+    Usa la columna 'País' asignada al cargar los datos, sin búsqueda espacial. Trabaja
+    sobre códigos enteros: los pares (país, especie) se deduplican con `np.unique` y se
+    cuentan por país con `np.bincount`, sin groupby sobre columnas de texto.
+
+    Args:
+        data: DataFrame con datos de ocurrencia.
+        country_data: GeoDataFrame con polígonos de países.
+
+    Returns:
+        Número de especies únicas de cada fila de `country_data`, en el mismo orden.
     """
+    # Códigos en el orden de filas de los países; -1 para registros fuera de todo país
+    country_codes = pd.Categorical(data["País"], categories=country_data["ADMIN"]).codes
+    species_codes = pd.Categorical(data["Especie"]).codes
+    in_country = country_codes >= 0
+    pairs = np.unique(
+        np.stack([country_codes[in_country], species_codes[in_country]], axis=1),
+        axis=0,
+    )
+    return np.bincount(pairs[:, 0], minlength=len(country_data))
 
-    locations = [
-        [row.decimalLatitude, row.decimalLongitude, row.Especie] for row in data.itertuples()
-    ]
 
-    FastMarkerCluster(
-        data=locations,
-        callback=callback,
-    ).add_to(point_map)
+@st.cache_resource(show_spinner=False)
+def _countries_geojson(_country_data: gpd.GeoDataFrame) -> dict:
+    """Serializa una sola vez los países a GeoJSON, con geometrías simplificadas.
 
-    return point_map
+    La simplificación reduce el GeoJSON enviado al navegador sin cambios visibles a escala
+    mundial, y convertir las geometrías a coordenadas solo se hace una vez por proceso. Las
+    búsquedas de país siguen usando las geometrías originales (underscore para evitar
+    hashing).
+
+    Args:
+        _country_data: GeoDataFrame con polígonos de países.
+
+    Returns:
+        FeatureCollection con 'ADMIN' como única propiedad, en el orden de filas de
+        `_country_data`. No debe modificarse: se comparte entre mapas.
+    """
+    countries = gpd.GeoDataFrame(
+        data={"ADMIN": _country_data["ADMIN"].to_numpy()},
+        geometry=shapely.simplify(
+            _country_data.geometry.values,
+            tolerance=SIMPLIFY_TOLERANCE,
+            preserve_topology=True,
+        ),
+        crs=_country_data.crs,
+    )
+    return json.loads(countries.to_json())
+
+
+@st.cache_resource(show_spinner=False)
+def _species_palette(vmin: int, vmax: int) -> np.ndarray:
+    """Tabla de colores de la escala para cada conteo de especies posible (cached).
+
+    Los conteos son enteros pequeños, así que la escala se evalúa una sola vez por valor
+    en lugar de interpolarse para cada país en cada mapa.
+
+    Args:
+        vmin: Mínimo de la escala de colores.
+        vmax: Máximo de la escala de colores.
+
+    Returns:
+        Arreglo de colores hexadecimales indexado por número de especies, de 0 a `vmax`.
+    """
+    from branca.colormap import LinearColormap
+
+    colormap = LinearColormap(colors=SPECIES_COLORS, vmin=vmin, vmax=vmax)
+    palette = np.array([colormap(v) for v in range(vmax + 1)], dtype=object)
+    palette[0] = NO_SPECIES_COLOR
+    return palette
 
 
 def create_choropleth_map(
-    data: gpd.GeoDataFrame,
+    data: pd.DataFrame,
     country_data: gpd.GeoDataFrame,
-) -> folium.Map:
+) -> "folium.Map":
     """Crea un mapa coroplético mostrando riqueza de especies por país.
 
     Args:
-        data: GeoDataFrame con datos de ocurrencia de especies.
+        data: DataFrame con datos de ocurrencia de especies.
         country_data: GeoDataFrame con polígonos de países.
 
     Returns:
         Mapa de Folium con colores por número de especies.
     """
-    # Spatial join para asignar país a cada punto
-    joined = gpd.sjoin(
-        data,
-        country_data,
-        how="inner",
-        predicate="within",
-    )
+    import folium
+    from branca.colormap import LinearColormap
 
-    # Contar especies únicas por país
-    species_by_country = (
-        joined.groupby("ADMIN")["Especie"].nunique().reset_index(name="num_species")
-    )
-
-    # Merge con geometrías de países
-    country_data_merged = country_data.merge(
-        right=species_by_country,
-        on="ADMIN",
-        how="left",
-    )
-    country_data_merged["num_species"] = country_data_merged["num_species"].fillna(0)
+    # Contar especies únicas por país; sigue el orden de filas de los países
+    num_species = _species_by_country(data=data, country_data=country_data)
 
     # Crear mapa base
     choropleth_map = folium.Map(
@@ -99,23 +258,43 @@ def create_choropleth_map(
     )
 
     # Crear escala de colores
-    min_species = country_data_merged["num_species"].min()
-    max_species = country_data_merged["num_species"].max()
+    min_species = int(num_species.min())
+    max_species = int(num_species.max())
 
     colormap = LinearColormap(
-        colors=["#fee5d9", "#fcae91", "#fb6a4a", "#de2d26", "#a50f15"],
+        colors=SPECIES_COLORS,
         vmin=min_species,
         vmax=max_species,
         caption="Número de especies",
     )
 
+    # Cada país toma su color por indexación, sin llamar a la escala por polígono
+    colors = _species_palette(vmin=min_species, vmax=max_species)[num_species]
+
+    # Solo las propiedades cambian con el filtro; las geometrías cacheadas se reutilizan
+    countries = _countries_geojson(_country_data=country_data)
+    features = [
+        {
+            **feature,
+            "properties": {
+                **feature["properties"],
+                "num_species": count,
+                "_color": color,
+            },
+        }
+        for feature, count, color in zip(
+            countries["features"],
+            num_species.tolist(),
+            colors,
+            strict=True,
+        )
+    ]
+
     # Agregar capa coroplética
     folium.GeoJson(
-        data=country_data_merged,
+        data={"type": "FeatureCollection", "features": features},
         style_function=lambda feature: {
-            "fillColor": colormap(feature["properties"]["num_species"])
-            if feature["properties"]["num_species"] > 0
-            else "#f0f0f0",
+            "fillColor": feature["properties"]["_color"],
             "color": "#333333",
             "weight": 0.5,
             "fillOpacity": 0.7,
@@ -132,19 +311,108 @@ def create_choropleth_map(
     return choropleth_map
 
 
-def create_top_species_chart(
-    data: gpd.GeoDataFrame,
-    top_n: int = 10,
-) -> None:
-    """Crea un gráfico de barras con las especies más comunes.
+@st.cache_data(show_spinner=False, max_entries=8)
+def _point_map_html(species_key: tuple[str, ...], _data: pd.DataFrame) -> str:
+    """Renderiza el mapa de puntos a HTML (cached por filtro de especies).
+
+    Se cachea el HTML y no el `folium.Map`: el mapa es costoso de hashear y se altera
+    al renderizarlo de nuevo.
 
     Args:
-        data: GeoDataFrame con columna 'species'.
-        top_n: Número de especies principales a mostrar.
+        species_key: Especies seleccionadas, ordenadas; es la única clave del cache.
+        _data: DataFrame con datos de ocurrencia (underscore para evitar hashing).
+
+    Returns:
+        Documento HTML completo del mapa.
+    """
+    point_map = create_point_map(data=_data)
+    return point_map.get_root().render()
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _choropleth_map_html(
+    species_key: tuple[str, ...],
+    _data: pd.DataFrame,
+    _country_data: gpd.GeoDataFrame,
+) -> str:
+    """Renderiza el mapa coroplético a HTML (cached por filtro de especies).
+
+    Args:
+        species_key: Especies seleccionadas, ordenadas; es la única clave del cache.
+        _data: DataFrame con datos de ocurrencia (underscore para evitar hashing).
+        _country_data: GeoDataFrame con polígonos de países (underscore para evitar
+            hashing).
+
+    Returns:
+        Documento HTML completo del mapa.
+    """
+    choropleth_map = create_choropleth_map(data=_data, country_data=_country_data)
+    return choropleth_map.get_root().render()
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _point_deck(species_key: tuple[str, ...], _data: pd.DataFrame) -> "pdk.Deck":
+    """Construye el mapa de puntos de deck.gl (cached por filtro de especies).
+
+    Se cachea el objeto, como las figuras de Plotly: `st.pydeck_chart` solo lo serializa y
+    no lo modifica.
+
+    Args:
+        species_key: Especies seleccionadas, ordenadas; es la única clave del cache.
+        _data: DataFrame con datos de ocurrencia (underscore para evitar hashing).
+
+    Returns:
+        Deck de pydeck con una capa de dispersión.
+    """
+    return create_point_deck(data=_data)
+
+
+def compute_species_counts(species: pd.Series, top_n: int) -> pd.DataFrame:
+    """Cuenta registros por especie con la agregación de Polars.
+
+    La especie llega como categórica desde la carga de datos; al convertirla a Polars se
+    conservan los códigos enteros, así que el conteo no vuelve a hashear cadenas.
+
+    Args:
+        species: Serie categórica con la especie de cada registro.
+        top_n: Número de especies principales a devolver.
+
+    Returns:
+        DataFrame con columnas 'Especie' y 'Número de registros', de mayor a menor.
     """
-    species_counts = data["Especie"].value_counts().reset_index()
-    species_counts.columns = ["Especie", "Número de registros"]
-    top_species = species_counts.head(top_n)
+    return (
+        pl.from_pandas(species)
+        .value_counts(sort=True, name="Número de registros")
+        .head(top_n)
+        .with_columns(pl.col("Especie").cast(pl.String))
+        .to_pandas()
+    )
+
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _top_species_figure(
+    species_counts: tuple[tuple[str, int], ...],
+    top_n: int,
+) -> "go.Figure":
+    """Construye la figura de barras de especies más comunes (cached por conteos).
+
+    La clave del cache son los propios pares (especie, conteo), de modo que filtros
+    distintos con el mismo resultado comparten figura. Se cachea el objeto y no su JSON:
+    Streamlit valida de nuevo los diccionarios, pero una figura ya construida no.
+
+    Args:
+        species_counts: Pares (especie, número de registros), de mayor a menor.
+        top_n: Número de especies principales mostradas (define la altura).
+
+    Returns:
+        Figura de Plotly lista para `st.plotly_chart`.
+    """
+    import plotly.express as px
+
+    top_species = pd.DataFrame(
+        data=species_counts,
+        columns=["Especie", "Número de registros"],
+    )
 
     fig = px.bar(
         data_frame=top_species,
@@ -163,50 +431,83 @@ def create_top_species_chart(
         font={"family": "Inter, sans-serif"},
     )
 
+    return fig
+
+
+def create_top_species_chart(
+    data: pd.DataFrame,
+    top_n: int = 10,
+) -> None:
+    """Crea un gráfico de barras con las especies más comunes.
+
+    Args:
+        data: DataFrame con columna 'Especie'.
+        top_n: Número de especies principales a mostrar.
+    """
+    top_species = compute_species_counts(
+        species=data["Especie"],
+        top_n=top_n,
+    )
+    species_counts = tuple(top_species.itertuples(index=False, name=None))
+
     st.plotly_chart(
-        figure_or_data=fig,
+        figure_or_data=_top_species_figure(species_counts=species_counts, top_n=top_n),
         width="stretch",
     )
 
     st.caption(HELP_BAR_CHART)
 
 
-def render_point_map(data: gpd.GeoDataFrame) -> None:
-    """Renderiza el mapa de puntos con wrapper HTML profesional.
+def render_point_map(
+    data: pd.DataFrame,
+    selected_species: list[str],
+    use_gpu: bool = False,
+) -> None:
+    """Renderiza el mapa de puntos en un único iframe.
+
+    El marco del mapa se aplica por CSS al propio iframe; no hacen falta elementos
+    `st.markdown` adicionales para abrir y cerrar un contenedor.
 
     Args:
-        data: GeoDataFrame con datos de ocurrencia.
+        data: DataFrame con datos de ocurrencia.
+        selected_species: Especies seleccionadas en el filtro (vacío si no hay filtro).
+        use_gpu: Si es True, dibuja los puntos con deck.gl en lugar de Folium.
     """
-    st.markdown('<div class="map-container">', unsafe_allow_html=True)
-    point_map = create_point_map(data=data)
-    st_folium(
-        fig=point_map,
-        width="stretch",
+    if use_gpu:
+        st.pydeck_chart(
+            pydeck_obj=_point_deck(species_key=tuple(sorted(selected_species)), _data=data),
+            height=600,
+        )
+        st.caption(HELP_POINT_DECK)
+        return
+
+    # El HTML cacheado es idéntico entre reruns, así que el iframe no se vuelve a dibujar
+    # hasta que cambian las especies seleccionadas
+    components.html(
+        html=_point_map_html(species_key=tuple(sorted(selected_species)), _data=data),
         height=600,
     )
-    st.markdown("</div>", unsafe_allow_html=True)
     st.caption(HELP_POINT_MAP)
 
 
 def render_choropleth_map(
-    data: gpd.GeoDataFrame,
+    data: pd.DataFrame,
+    selected_species: list[str],
     country_data: gpd.GeoDataFrame,
 ) -> None:
-    """Renderiza el mapa coroplético con wrapper HTML profesional.
+    """Renderiza el mapa coroplético en un único iframe.
 
     Args:
-        data: GeoDataFrame con datos de ocurrencia.
+        data: DataFrame con datos de ocurrencia.
+        selected_species: Especies seleccionadas en el filtro (vacío si no hay filtro).
         country_data: GeoDataFrame con polígonos de países.
     """
-    st.markdown('<div class="map-container">', unsafe_allow_html=True)
-    m = create_choropleth_map(
-        data=data,
-        country_data=country_data,
-    )
-    st_folium(
-        fig=m,
-        width="stretch",
+    components.html(
+        html=_choropleth_map_html(
+            species_key=tuple(sorted(selected_species)),
+            _data=data,
+            _country_data=country_data,
+        ),
         height=600,
     )
-    st.markdown("</div>", unsafe_allow_html=True)
     st.caption(HELP_CHOROPLETH)